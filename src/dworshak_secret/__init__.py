@@ -1,8 +1,34 @@
-# src/dworshak_access/__init__.py
+# src/dworshak_secret/__init__.py
 from __future__ import annotations
-from .core import DworshakSecret
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .core import DworshakSecret
 
 __all__ = [
     "DworshakSecret"
 ]
 
+def __getattr__(name: str):
+    # PEP 562: core (and sqlite3 with it) loads on first use, so importing
+    # the package, e.g. for the CLI's --help or --version, stays cheap.
+    if name == "DworshakSecret":
+        from .core import DworshakSecret
+        return DworshakSecret
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+if os.environ.get("DWORSHAK_EAGER") == "1":
+    # Long-lived workers: pay for every import at startup, not on first request
+    from .core import DworshakSecret
+    from . import vault  # also loads sqlite3, which core now imports lazily
+    from .security import _load_rfernet
+    _load_rfernet()
+    try:
+        import cryptography.fernet
+        from .crypto import aesgcm
+    except ImportError:
+        pass
@@ -1,23 +1,24 @@
 """
 Entry point for dworshak-secret Rich/Typer CLI.
 """
-TYPERSUCCESS=None
-try:
-    import typer
-    TYPERSUCCESS=True
-except (ImportError, ModuleNotFoundError):
-    # Fallback to the 'lifeboat' CLI
-    #from .cli_stdlib import main as run
-    TYPERSUCCESS=False
+import sys
+import importlib.util
 
-if TYPERSUCCESS:
-    # Attempt to use the feature-rich CLI
-    from .cli import app
-    def run():
+# find_spec probes for Typer without importing it
+TYPERSUCCESS = importlib.util.find_spec("typer") is not None
+
+def run():
+    # Answer a bare --version before Typer, Rich or the vault are imported
+    if sys.argv[1:] == ["--version"]:
+        from ._version import __version__
+        print(__version__)
+        return
+
+    if TYPERSUCCESS:
+        # Attempt to use the feature-rich CLI
+        from .cli import app
         app()
-else:
-    import sys
-    def run():
+    else:
         print(
             "Please install this package with the 'typer' extra to utilize the CLI.", 
             file=sys.stderr
@@ -1,10 +1,6 @@
-# src/dworshak_access/actions.py
+# src/dworshak_secret/actions.py
 from __future__ import annotations
 import sqlite3
-import json
-import datetime
-import shutil
-import sys
 import os
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -16,7 +12,7 @@ if TYPE_CHECKING:
     from .core import DworshakSecret
 
 from .paths import (
-    DB_FILE, 
+    resolve_db_path,
     get_default_export_path, 
     ensure_secure_permissions, 
     get_backup_path,
@@ -32,11 +28,13 @@ def export_vault(
     yes: bool = False
 ) -> str | None:
     """Orchestrates a full vault export with metadata."""
+    import json
+    import datetime
 
     if db_path and str(db_path) == ":memory:":
         return None
 
-    db_path = Path(db_path) if db_path else DB_FILE
+    db_path = resolve_db_path(db_path)
     if not db_path.exists():
         return None
 
@@ -46,24 +44,29 @@ def export_vault(
         output_path = get_default_export_path()
     output_path = Path(output_path)
 
-    status = vault.check_vault(db_path,key_path)
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    status = vault.check_vault(db_path)
     
     try:
-        # These extraction helpers remain in vault.py as they are low-level DB I/O
-        if decrypt and yes:
-            # We construct a transient manager context cleanly here for the standalone execution
-            from .core import DworshakSecret
-            mngr = DworshakSecret(db_path=db_path, key_path=key_path)
-            table_data = _fill_db_dump_decrypted(conn, client=mngr)
-        else:
-            table_data = _fill_db_dump_encrypted(conn)
+        conn = vault.connect(db_path)
+        try:
+            # One read snapshot across all tables. The connection is closed
+            # before serializing, so json.dump never holds up writers or
+            # WAL checkpoints.
+            with vault.transaction(conn, "DEFERRED"):
+                backend = None
+                if decrypt and yes:
+                    # Decrypt-only use: the GCM backend reads Fernet blobs too
+                    from .crypto.aesgcm import AESGCMBackend
+                    backend = AESGCMBackend.from_key_path(key_path)
+                table_data = _fill_db_dump(conn, backend=backend)
+        finally:
+            conn.close()
 
         export_package = {
             "metadata": {
                 "export_time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
                 "decrypted": decrypt,
+                "blob_encoding": BLOB_ENCODING,
                 "vault_schema_version": status.vault_db_version,
                 "dworshak_tool_schema_version": vault.CURRENT_TOOL_SCHEMA_VERSION,
             },
@@ -71,7 +74,7 @@ def export_vault(
         }
 
         with open(output_path, "w") as f:
-            json.dump(export_package, f, indent=4)
+            json.dump(export_package, f, separators=(",", ":"))
 
         if os.name != "nt":
             output_path.chmod(0o600)
@@ -80,8 +83,6 @@ def export_vault(
     except Exception as e:
         logger.error(f"Export failed: {e}")
         return None
-    finally:
-        conn.close()
 
 def import_records(
     client: DworshakSecret,
@@ -89,6 +90,7 @@ def import_records(
     overwrite: bool = False
 ) -> dict | None:
     """Merges records from JSON. Triggers safety backup if overwriting."""
+    import json
     
     if json_path is None:
         return {}
@@ -102,14 +104,19 @@ def import_records(
 
     creds = data.get("tables", {}).get("credentials", [])
     
+    # One SELECT of existing keys serves both the overlap check and the
+    # per-row classification; no secret needs decrypting to test existence.
+    existing_keys = set(client.iter_contents())
+
     # 1. Safety Check: If we are overwriting, backup the DB first
-    overlap = _get_overlap(creds, client)
+    overlap = _get_overlap(creds, existing_keys)
     if overlap and overwrite:
         if client.db_path and str(client.db_path) != ":memory:":
             _trigger_safety_backup(Path(client.db_path))
 
-    # 2. Process records
+    # 2. Classify records, then write them all in one transaction
     stats = {"added": 0, "updated": 0, "skipped": 0}
+    to_store = []
     for row in creds:
         service, item = row.get("service"), row.get("item")
         secret = row.get("encrypted_secret")
@@ -117,16 +124,18 @@ def import_records(
         if not (service and item and secret):
             continue
 
-        existing = client.get(service, item)
-        if existing is None:
-            client.set(service, item, secret)
+        if (service, item) not in existing_keys:
+            to_store.append((service, item, secret))
             stats["added"] += 1
         elif overwrite:
-            client.set(service, item, secret)
+            to_store.append((service, item, secret))
             stats["updated"] += 1
         else:
             stats["skipped"] += 1
 
+    if to_store:
+        client.set_many(to_store)
+
     return stats
 
 def backup_vault(
@@ -139,7 +148,7 @@ def backup_vault(
     if db_path and str(db_path) == ":memory:":
         return None
 
-    db_path = Path(db_path) if db_path else DB_FILE
+    db_path = resolve_db_path(db_path)
     if not db_path.exists():
         return None
 
@@ -150,7 +159,7 @@ def backup_vault(
     )
 
     try:
-        shutil.copy2(db_path, backup_path)
+        vault.backup_to(db_path, backup_path)
         ensure_secure_permissions(backup_path)
         return backup_path
     except Exception:
@@ -164,56 +173,67 @@ def _validate_import_meta(meta: dict) -> bool:
         return False
     return True
 
-def _get_overlap(incoming_creds: list, client: DworshakSecret) -> set[tuple[str, str]]:
+def _get_overlap(incoming_creds: list, existing_keys: set[tuple[str, str]]) -> set[tuple[str, str]]:
     incoming_keys = {
         (row['service'], row['item']) 
         for row in incoming_creds 
         if 'service' in row and 'item' in row
     }
-    existing_keys = set(client.list_contents())
     return incoming_keys.intersection(existing_keys)
 
 def _trigger_safety_backup(db_path: Path):
+    import datetime
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_path = db_path.with_suffix(f".db.bak_{timestamp}")
-    shutil.copy2(db_path, backup_path)
+    vault.backup_to(db_path, backup_path)
     logger.debug(f"Safety backup created: {backup_path.name}")
     return backup_path
 
 # --- Low Level Data Extractors (Used by actions.py) ---
 
-def _fill_db_dump_encrypted(conn: sqlite3.Connection) -> dict:
-    tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
-    db_dump = {}
-    for table in tables:
-        t_name = table[0]
-        cursor = conn.execute(f"SELECT * FROM {t_name}")
-        db_dump[t_name] = [
-            {k: (v.hex() if isinstance(v, bytes) else v) for k, v in dict(row).items()}
-            for row in cursor.fetchall()
-        ]
-    return db_dump
-
-def _fill_db_dump_decrypted(
-        conn: sqlite3.Connection, 
-        client: DworshakSecret
-    ) -> dict:
+_FETCH_SIZE = 1000
+# BLOB columns are written as base64 text: 4/3 the raw size, versus 2x for hex
+BLOB_ENCODING = "base64"
+
+def _iter_table_rows(conn: sqlite3.Connection, t_name: str):
+    """Yields (columns, batch) pairs for a table, fetchmany() at a time."""
+    # Table names come from sqlite_master; quote them as identifiers anyway
+    cursor = conn.execute('SELECT * FROM "' + t_name.replace('"', '""') + '"')
+    cursor.arraysize = _FETCH_SIZE
+    cols = [c[0] for c in cursor.description]
+    while True:
+        batch = cursor.fetchmany()
+        if not batch:
+            break
+        yield cols, batch
+
+def _fill_db_dump(conn: sqlite3.Connection, backend=None) -> dict:
+    """
+    Dumps every table to lists of row dicts, BLOBs base64-encoded.
+    With a crypto backend, encrypted_secret holds the decrypted plaintext.
+    """
+    from base64 import b64encode
+    from .crypto.base import decrypt_row
     tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
     db_dump = {}
     
     for table in tables:
         t_name = table[0]
-        cursor = conn.execute(f"SELECT * FROM {t_name}")
-        rows = [dict(row) for row in cursor.fetchall()]
-        
-        for row in rows:
-            if "service" in row and "item" in row:
-                try:
-                    row["encrypted_secret"] = client.get(row["service"], row["item"])
-                except Exception:
-                    row["encrypted_secret"] = "DECRYPTION_FAILED"
-            
-            for k, v in row.items():
-                if isinstance(v, bytes): row[k] = v.hex()
-        db_dump[t_name] = rows
+        rows_out = []
+        for cols, batch in _iter_table_rows(conn, t_name):
+            i_secret = None
+            if backend is not None and {"service", "item", "encrypted_secret"} <= set(cols):
+                i_secret = cols.index("encrypted_secret")
+                i_service, i_item = cols.index("service"), cols.index("item")
+            for row in batch:
+                out = {c: (b64encode(v).decode("ascii") if type(v) is bytes else v) for c, v in zip(cols, row)}
+                if i_secret is not None:
+                    try:
+                        out["encrypted_secret"] = decrypt_row(
+                            backend, row[i_secret], row[i_service], row[i_item]
+                        ).decode()
+                    except Exception:
+                        out["encrypted_secret"] = "DECRYPTION_FAILED"
+                rows_out.append(out)
+        db_dump[t_name] = rows_out
     return db_dump
@@ -1,20 +1,16 @@
 # src/dworshak_secret/cli.py
 from __future__ import annotations
-import pyhabitat
 import typer
 import os
 import sys
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.logging import RichHandler
 from click.exceptions import Abort
 from pathlib import Path
 from typing import Optional
 from typer_helptree import add_typer_helptree
-import logging
+import importlib.util
+import functools
 
-from .logging_setup import configure_logging_for_application
 from ._version import __version__
 
 # sentinel value to allow empty strings to be passed
@@ -26,6 +22,28 @@ console = Console(stderr=True)
 os.environ["FORCE_COLOR"] = "1"
 os.environ["TERM"] = "xterm-256color"
 
+def _print_status_error(status):
+    # One print (one render pass) for the whole block
+    console.print(f"status.is_valid = {status.is_valid}\nstatus.message = {status.message}")
+
+def _require_healthy_vault(command):
+    """
+    Check the vault named by the command's --vault-path before its body runs;
+    print the status and exit if it is not usable.
+    """
+    @functools.wraps(command)
+    def wrapper(*args, **kwargs):
+        from .core import DworshakSecret
+        # The full check runs here only; the command's own get/set/remove go
+        # through the stat-based check_vault_fast(), whose result is kept for
+        # the rest of the process
+        status = DworshakSecret(db_path=kwargs.get("path")).check_vault()
+        if not status.is_valid:
+            _print_status_error(status)
+            raise typer.Exit(code=0)
+        return command(*args, **kwargs)
+    return wrapper
+
 def print_prompt_hint(service:str="SERVICE",item:str="ITEM"):
     console.print(
         "[yellow]Secret not provided.[/yellow]\n\n"
@@ -57,12 +75,8 @@ app.add_typer(vault_app, name="vault")
 add_typer_helptree(app=app, console=console, version = __version__,hidden=False)
 
 
-# 1. Check for crypto before importing vault logic
-try:
-    import cryptography
-    CRYPTO_AVAILABLE = True
-except ImportError:
-    CRYPTO_AVAILABLE = False
+# 1. Check for crypto before importing vault logic (find_spec: without importing it)
+CRYPTO_AVAILABLE = importlib.util.find_spec("cryptography") is not None
 
 # 2. Define the help message here or import it
 MSG_CRYPTO_HELP_MSG = """
@@ -80,9 +94,9 @@ def crypto_instructions():
         from rich.console import Console
         Console(stderr=True).print(MSG_CRYPTO_HELP_MSG)
         raise typer.Exit(code=1)
-                
-from .core import DworshakSecret
-from .actions import import_records
+
+# Commands import DworshakSecret (and with it sqlite3 and the vault) on
+# their own, so --help and --version skip that import chain.
 from .errors import WrongKeyError
 
 @app.callback(invoke_without_command=True, no_args_is_help=True)
@@ -98,6 +112,7 @@ def main(ctx: typer.Context,
         typer.echo(__version__)
         raise typer.Exit(code=0)
 
+    from .logging_setup import configure_logging_for_application
     configure_logging_for_application(debug, verbose)
     
     if ctx.invoked_subcommand not in [None]:
@@ -109,6 +124,8 @@ def setup(
     key_path: Optional[Path] = typer.Option(None, "--key-path", "-kp", help="Custom key path.")
     ):
     """Initialize vault and encryption key."""
+    from rich.panel import Panel
+    from .core import DworshakSecret
     secret_manager = DworshakSecret(db_path=path, key_path=key_path)
     res = secret_manager.initialize_vault()
     
@@ -125,6 +142,7 @@ def setup(
         raise typer.Exit(code=1)
 
 @app.command()
+@_require_healthy_vault
 def set(
     service: str = typer.Argument(..., help="Service name."),
     item: str = typer.Argument(..., help="Item key."),
@@ -139,6 +157,8 @@ def set(
     overwrite: bool = typer.Option(False, "--overwrite/--no-overwrite", help="Force a value setting even if one already exists.")
 ):
     """Store a new credential in the vault."""
+    import pyhabitat
+    from .core import DworshakSecret
 
     secret_manager = DworshakSecret(db_path=path, key_path=key_path)
     
@@ -181,13 +201,8 @@ def set(
             print_prompt_hint(service, item)
             raise typer.Exit(code=1)
     
-    status = secret_manager.check_vault()
-    if not status.is_valid:
-        console.print(f"status.is_valid = {status.is_valid}")
-        console.print(f"status.message = {status.message}")
-        raise typer.Exit(code=0)
-    
-    if overwrite and (service, item) in secret_manager.list_contents():
+    # existing_secret was fetched above; no need to list the whole vault
+    if overwrite and existing_secret is not None:
         console.print(f"[yellow]Overwriting credential {service}/{item}[/yellow]")
     
     secret_manager.set(service = service, item = item, value = secret, overwrite=overwrite)
@@ -199,6 +214,7 @@ def set(
     
 
 @app.command()
+@_require_healthy_vault
 def get(
     service: str = typer.Argument(..., help="Service name."),
     item: str = typer.Argument(..., help="Item key."),
@@ -208,15 +224,9 @@ def get(
     emit: bool = typer.Option(False, "--emit","-e",help ="Emit the value to stdout.")
 ):
     """Retrieve a credential from the vault."""
+    from .core import DworshakSecret
     
     secret_manager = DworshakSecret(db_path=path, key_path=key_path)
-    status = secret_manager.check_vault()
-    
-    if not status.is_valid:
-        console.print(f"status.is_valid = {status.is_valid}")
-        console.print(f"status.message = {status.message}")
-        raise typer.Exit(code=0)
-    
 
     try:
         existing_secret = secret_manager.get(service=service, item=item, fail=fail)
@@ -237,6 +247,7 @@ def get(
         typer.echo("(use --emit to emit value)", err=True)
     
 @app.command()
+@_require_healthy_vault
 def remove(
     service: str = typer.Argument(..., help="Service name."),
     item: str = typer.Argument(..., help="Item key."),
@@ -251,14 +262,8 @@ def remove(
     fail: bool = typer.Option(False, "--fail", help="Raise error if secret not found")
 ):
     """Remove a credential from the vault."""
+    from .core import DworshakSecret
     secret_manager = DworshakSecret(db_path=path, key_path=key_path)
-    status = secret_manager.check_vault()
-    
-    if not status.is_valid:
-        console.print(f"status.is_valid = {status.is_valid}")
-        console.print(f"status.message = {status.message}")
-        raise typer.Exit(code=0)
-    
     existing_secret = secret_manager.get(service=service, item=item, fail=fail)
     if existing_secret is None:
         typer.echo(f"No credential found for {service}/{item}", err=True)
@@ -283,23 +288,18 @@ def remove(
 
 
 @app.command(name = "list")
+@_require_healthy_vault
 def list_entries(
     path: Optional[Path] = typer.Option(None, "--vault-path", "-vp", help="Custom vault file path."),
 ):
     """List all stored credentials."""
+    from rich.table import Table
+    from .core import DworshakSecret
     secret_manager = DworshakSecret(db_path=path)
-    status = secret_manager.check_vault()
-    
-    if not status.is_valid:
-        console.print(f"status.is_valid = {status.is_valid}")
-        console.print(f"status.message = {status.message}")
-        raise typer.Exit(code=0)
-    
-    creds = secret_manager.list_contents()
     table = Table(title="Stored Credentials")
     table.add_column("Service", style="cyan")
     table.add_column("Item", style="green")
-    for service, item in creds:
+    for service, item in secret_manager.iter_contents():
         table.add_row(service, item)
     console.print(table)
 
@@ -307,10 +307,12 @@ def list_entries(
 def health(
     path: Optional[Path] = typer.Option(None, "--vault-path", "-vp", help="Custom vault file path."),
     key_path: Optional[Path] = typer.Option(None, "--key-path", "-kp", help="Custom key path."),
+    deep: bool = typer.Option(False, "--deep", is_flag=True, help="Run the full (slow) integrity check instead of the quick check."),
     ):
     """Check vault integrity and permissions."""
+    from .core import DworshakSecret
     secret_manager = DworshakSecret(db_path=path)
-    vault_status = secret_manager.check_vault()
+    vault_status = secret_manager.check_vault(deep=deep)
     console.print(vault_status)
 
     if key_path:
@@ -342,6 +344,7 @@ def export(
     """
     Export the current vault to a JSON file.
     """
+    from .core import DworshakSecret
     # export_vault handles default paths internally if output_path is None
     if decrypt and not yes:
         yes = typer.confirm(
@@ -385,19 +388,22 @@ def import_cmd(
     """
     Import a properly structured JSON file into the Dworshak vault.
     """
+    from .core import DworshakSecret
     # import_records returns a dict of stats: {"added": x, "updated": y, "skipped": z}
 
     secret_manager = DworshakSecret(db_path=path,key_path=key_path)
     status = secret_manager.check_vault()
     
-    stats = secret_manager.import_records(client=secret_manager,json_path = json_path, overwrite=overwrite)
+    stats = secret_manager.import_records(json_path = json_path, overwrite=overwrite)
     #stats = import_records(json_path = json_path, db_path = path, overwrite=overwrite)
     
     if stats:
-        console.print(f"\n[bold]Import Summary for {path.name}:[/bold]")
-        console.print(f"  [green]Added:[/green]   {stats['added']}")
-        console.print(f"  [yellow]Updated:[/yellow] {stats['updated']}")
-        console.print(f"  [blue]Skipped:[/blue] {stats['skipped']}")
+        console.print(
+            f"\n[bold]Import Summary for {secret_manager.db_path.name}:[/bold]\n"
+            f"  [green]Added:[/green]   {stats['added']}\n"
+            f"  [yellow]Updated:[/yellow] {stats['updated']}\n"
+            f"  [blue]Skipped:[/blue] {stats['skipped']}"
+        )
     else:
         console.print("[red]Import failed or rejected.[/red]")
 
@@ -425,6 +431,7 @@ def rotate_key_cmd(
     A backup is created automatically unless --no-backup is specified.
     Use --dry-run first to preview what will happen.
     """
+    from .core import DworshakSecret
     secret_manager = DworshakSecret(db_path=path,key_path=key_path)
     status = secret_manager.check_vault()
     
@@ -466,6 +473,7 @@ def backup(
     ),
 ):
     """Create a timestamped backup copy of the vault database."""
+    from .core import DworshakSecret
     secret_manager = DworshakSecret(db_path=path)
     status = secret_manager.check_vault()
     
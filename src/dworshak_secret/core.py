@@ -1,12 +1,25 @@
 from __future__ import annotations
-import sqlite3
+import os
 from pathlib import Path
-from typing import Optional, Any
-import sys
+from typing import Any, Iterable
 import logging
+from contextlib import contextmanager
 
-from .paths import DB_FILE, KEY_FILE
-from .vault import initialize_vault, ensure_vault, check_vault, check_key_file
+from .paths import resolve_db_path
+from .crypto.base import encrypt_row, decrypt_row
+# sqlite3 and .vault are imported in the methods that need them, so building a
+# client (or `--help`) does not pay for them.
+
+# SQL is kept in module constants so every call passes the same text and hits
+# the connection's prepared-statement cache.
+_SQL_GET = "SELECT encrypted_secret FROM credentials WHERE service=? AND item=? LIMIT 1"
+_SQL_UPSERT = "INSERT OR REPLACE INTO credentials (service, item, encrypted_secret) VALUES (?, ?, ?)"
+_SQL_INSERT = "INSERT INTO credentials (service, item, encrypted_secret) VALUES (?, ?, ?)"
+_SQL_DELETE = "DELETE FROM credentials WHERE service=? AND item=?"
+_SQL_LIST = "SELECT service, item FROM credentials"
+
+# Ciphers for new writes. Reads follow each blob's format, whichever is set.
+CIPHERS = ("fernet", "aesgcm")
 
 class DworshakSecret:
     """
@@ -23,12 +36,9 @@ class DworshakSecret:
         db_path: Path | str | None = None,
         key_path: Path | str | None = None,
         crypto_backend: Any | None = None,
+        cipher: str | None = None,
     ):
-        self.db_path = (
-            Path(db_path).expanduser().resolve() 
-            if db_path 
-            else DB_FILE
-        )
+        self.db_path = resolve_db_path(db_path)
         self._key_path_override = (
             Path(key_path).expanduser().resolve() 
             if key_path 
@@ -37,6 +47,34 @@ class DworshakSecret:
         self._resolved_key_path: Path | None = None
         # IMPORTANT: do NOT initialize crypto here
         self._crypto_backend = crypto_backend
+        # Only names the cipher; the backend is still built lazily
+        self.cipher = (cipher or os.environ.get("DWORSHAK_CIPHER") or "fernet").lower()
+        if self.cipher not in CIPHERS:
+            raise ValueError(f"Unknown cipher {self.cipher!r}; expected one of {CIPHERS}")
+        # Inside a `with` block the vault is validated once, not per call
+        self._in_context = False
+        self._vault_validated = False
+
+    # ----------------------------
+    # Connection lifecycle
+    # ----------------------------
+
+    def close(self):
+        """
+        Close this thread's pooled connection to the vault. Optional: the pool
+        is closed at exit, and the next call simply reopens it.
+        """
+        from .vault import close_connections
+        close_connections(self.db_path)
+
+    def __enter__(self) -> DworshakSecret:
+        self._in_context = True
+        return self
+
+    def __exit__(self, *exc_info):
+        self._in_context = False
+        self._vault_validated = False
+        self.close()
 
     # ----------------------------
     # Path resolution
@@ -59,22 +97,22 @@ class DworshakSecret:
         if self._crypto_backend:
             return self._crypto_backend
 
+        # Not stored on the instance: the cipher cache is keyed on the key
+        # file's stat, so a rotated key is picked up on the next call.
+        # Either backend decrypts both blob formats; cipher only picks writes.
+        if self.cipher == "aesgcm":
+            from .crypto.aesgcm import AESGCMBackend
+            return AESGCMBackend.from_key_path(self.resolve_key_path())
         from .crypto.fernet import FernetBackend
-        from .key import load_current_key
-        key_path = self.resolve_key_path()
-        
-        key_bytes = load_current_key(key_path=key_path)
-        self._crypto_backend = FernetBackend(key_bytes.decode('utf-8'))
-        
-        #key_str = get_key_str_from_key_path(key_path=key_path)
-        #self._crypto_backend = FernetBackend(key_str = key_str)
-        return self._crypto_backend
+        return FernetBackend.from_key_path(self.resolve_key_path())
 
     # ----------------------------
     # Vault lifecycle wrappers
     # ----------------------------
 
     def initialize_vault(self, **kwargs):
+        from .vault import initialize_vault
+        self._vault_validated = False
         return initialize_vault(
             db_path=self.db_path,
             key_path=self.resolve_key_path(),
@@ -82,17 +120,38 @@ class DworshakSecret:
         )
 
     def ensure_vault_or_raise(self):
-        return ensure_vault(
+        if self._vault_validated:
+            return
+        from .vault import ensure_vault
+        ensure_vault(
             db_path=self.db_path,
         )
+        self._vault_validated = self._in_context
+
+    @contextmanager
+    def _vault_connection(self):
+        """
+        Validated pooled connection for one operation. An OperationalError
+        (e.g. the vault file was removed) forces revalidation on the next call.
+        """
+        import sqlite3
+        from .vault import get_connection
+        self.ensure_vault_or_raise()
+        try:
+            yield get_connection(self.db_path)
+        except sqlite3.OperationalError:
+            self._vault_validated = False
+            raise
 
     def check_key_file(self, **kwargs):
+        from .vault import check_key_file
         return check_key_file(
             key_path=self.resolve_key_path(),
             **kwargs
         )
 
     def check_vault(self, **kwargs):
+        from .vault import check_vault
         return check_vault(
             db_path=self.db_path,
             **kwargs
@@ -110,24 +169,16 @@ class DworshakSecret:
         crypto_backend=None
         ):
         backend = crypto_backend or self.crypto_backend
-        
-        self.ensure_vault_or_raise()
 
-        conn = sqlite3.connect(self.db_path)
-        try:
-            row = conn.execute(
-                "SELECT encrypted_secret FROM credentials WHERE service=? AND item=?",
-                (service, item)
-            ).fetchone()
-        finally:
-            conn.close()
+        with self._vault_connection() as conn:
+            row = conn.execute(_SQL_GET, (service, item)).fetchone()
 
         if not row:
             if fail:
                 raise KeyError(f"Missing {service}/{item}")
             return None
 
-        return backend.decrypt(row[0]).decode()
+        return decrypt_row(backend, row[0], service, item).decode()
 
     def set(
         self,
@@ -137,69 +188,58 @@ class DworshakSecret:
         overwrite: bool = True,
         crypto_backend=None
     ):
-        self.ensure_vault_or_raise()
+        with self._vault_connection() as conn:
+            backend = crypto_backend or self.crypto_backend
+            encrypted = encrypt_row(backend, value.encode(), service, item)
 
-        backend = crypto_backend or self.crypto_backend
-        encrypted = backend.encrypt(value.encode())
-
-        conn = sqlite3.connect(self.db_path)
-
-        try:
             if overwrite:
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO credentials
-                    (service, item, encrypted_secret)
-                    VALUES (?, ?, ?)
-                    """,
-                    (service, item, encrypted),
-                )
+                conn.execute(_SQL_UPSERT, (service, item, encrypted))
 
             else:
+                import sqlite3
                 try:
-                    conn.execute(
-                        """
-                        INSERT INTO credentials
-                        (service, item, encrypted_secret)
-                        VALUES (?, ?, ?)
-                        """,
-                        (service, item, encrypted),
-                    )
+                    conn.execute(_SQL_INSERT, (service, item, encrypted))
 
                 except sqlite3.IntegrityError:
                     raise KeyError(
                         f"Credential already exists: {service}/{item}"
                     )
+            
+    def set_many(
+        self,
+        items: Iterable[tuple[str, str, str]],
+        crypto_backend=None
+    ):
+        """
+        Store many (service, item, value) credentials, overwriting existing ones,
+        in a single transaction: one commit instead of one per credential.
 
-            conn.commit()
+        Rows are encrypted lazily as executemany() binds them, so no list of
+        ciphertexts is built; a failure part way through rolls back everything.
+        """
+        from .vault import transaction
+        with self._vault_connection() as conn:
+            backend = crypto_backend or self.crypto_backend
+            rows = (
+                (service, item, encrypt_row(backend, value.encode(), service, item))
+                for service, item, value in items
+            )
 
-        finally:
-            conn.close()
+            with transaction(conn):
+                conn.executemany(_SQL_UPSERT, rows)
             
     def remove(self, service: str, item: str) -> bool:
-        self.ensure_vault_or_raise()
+        with self._vault_connection() as conn:
+            cur = conn.execute(_SQL_DELETE, (service, item))
+        return cur.rowcount > 0
 
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cur = conn.execute(
-                "DELETE FROM credentials WHERE service=? AND item=?",
-                (service, item),
-            )
-            conn.commit()
-            return cur.rowcount > 0
-        finally:
-            conn.close()
+    def iter_contents(self):
+        """Yield (service, item) pairs straight from the cursor, without a list."""
+        with self._vault_connection() as conn:
+            yield from conn.execute(_SQL_LIST)
 
     def list_contents(self):
-        self.ensure_vault_or_raise()
-
-        conn = sqlite3.connect(self.db_path)
-        try:
-            return conn.execute(
-                "SELECT service, item FROM credentials"
-            ).fetchall()
-        finally:
-            conn.close()
+        return list(self.iter_contents())
 
     # --- Wrappers around vault functions ---
     # To pass the db_path attribute. Use **kwargs to relieve maintenance burden for wrappers.
@@ -2,6 +2,12 @@
 from __future__ import annotations
 from typing import Protocol
 
+# Leading byte of AES-GCM blobs. Fernet tokens are base64 text whose first
+# byte is always b"g" (version 0x80), so this tells the formats apart.
+AESGCM_VERSION = b"\x01"      # no associated data
+AESGCM_ROW_VERSION = b"\x02"  # bound to its (service, item) row
+AESGCM_VERSIONS = (AESGCM_VERSION, AESGCM_ROW_VERSION)
+
 
 class CryptoBackend(Protocol):
     """
@@ -10,6 +16,9 @@ class CryptoBackend(Protocol):
     Any implementation must provide:
     - encrypt(bytes) -> bytes
     - decrypt(bytes) -> bytes
+
+    Backends that set accepts_aad = True also take an `aad` keyword on both,
+    which DworshakSecret fills with row_aad(service, item).
     """
 
     def encrypt(self, data: bytes) -> bytes:
@@ -23,3 +32,23 @@ class CryptoBackend(Protocol):
         Decrypt ciphertext bytes and return plaintext bytes.
         """
         ...
+
+def row_aad(service: str, item: str) -> bytes:
+    """
+    Associated data binding a ciphertext to its credential row, so a blob
+    copied onto another row fails to decrypt. The length prefix keeps
+    ("a/b", "c") and ("a", "b/c") distinct.
+    """
+    return f"{len(service)}:{service}/{item}".encode()
+
+def encrypt_row(backend, data: bytes, service: str, item: str) -> bytes:
+    """backend.encrypt(), bound to the row when the backend takes aad."""
+    if getattr(backend, "accepts_aad", False):
+        return backend.encrypt(data, aad=row_aad(service, item))
+    return backend.encrypt(data)
+
+def decrypt_row(backend, data: bytes, service: str, item: str) -> bytes:
+    """backend.decrypt() for a blob read from the given row."""
+    if getattr(backend, "accepts_aad", False):
+        return backend.decrypt(data, aad=row_aad(service, item))
+    return backend.decrypt(data)
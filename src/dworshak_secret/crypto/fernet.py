@@ -1,12 +1,19 @@
-# src/dworshak_secret/crytpo/fernet.py
+# src/dworshak_secret/crypto/fernet.py
 from __future__ import annotations
 from cryptography.fernet import Fernet
 from cryptography.fernet import InvalidToken
-from .base import CryptoBackend
-from ..security import get_fernet
+from .base import CryptoBackend, AESGCM_VERSIONS
+from ..security import get_fernet, get_cached_fernet
 from ..errors import WrongKeyError
 
 class FernetBackend(CryptoBackend):
+    # Set by from_key_path(): lets decrypt() hand AES-GCM blobs, written by an
+    # aesgcm client on the same vault, to the AES-GCM backend for that key.
+    key_path = None
+    # aad is accepted so row-bound AES-GCM blobs can be forwarded; Fernet
+    # tokens themselves carry no associated data.
+    accepts_aad = True
+
     def __init__(self, key_str):
         self.fernet = get_fernet(key_str=key_str)
         
@@ -18,15 +25,27 @@ class FernetBackend(CryptoBackend):
         obj = cls.__new__(cls)
         obj.fernet = fernet_obj
         return obj
+
+    @classmethod
+    def from_key_path(cls, key_path):
+        fernet = get_cached_fernet(key_path)
+        if not fernet:
+            raise RuntimeError("Crypto unavailable")
+        obj = cls.from_fernet(fernet)
+        obj.key_path = key_path
+        return obj
                 
-    def encrypt(self, data: bytes) -> bytes:
+    def encrypt(self, data: bytes, aad: bytes | None = None) -> bytes:
         try:
             return self.fernet.encrypt(data)
         except InvalidToken:
             raise WrongKeyError("Invalid encryption key or corrupted data.") from None
 
     
-    def decrypt(self, data: bytes) -> bytes:
+    def decrypt(self, data: bytes, aad: bytes | None = None) -> bytes:
+        if data[:1] in AESGCM_VERSIONS and self.key_path is not None:
+            from .aesgcm import AESGCMBackend
+            return AESGCMBackend.from_key_path(self.key_path).decrypt(data, aad=aad)
         try:
             return self.fernet.decrypt(data)
         except InvalidToken:
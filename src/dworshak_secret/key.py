@@ -13,21 +13,22 @@ from pathlib import Path
 from typing import Tuple, List, Optional, TYPE_CHECKING
 from dataclasses import dataclass
 import sys
+import os
 
 if TYPE_CHECKING:
     from .core import DworshakSecret
 
-from .paths import resolve_key_path_for_db, ensure_secure_permissions
+from .paths import resolve_key_path_for_db
 from .registry import register_vault_key
+from .errors import WrongKeyError
 
 try:
-    from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+    from cryptography.fernet import Fernet, InvalidToken
     CRYPTO_AVAILABLE = True
 except ImportError:
     CRYPTO_AVAILABLE = False
     Fernet=None
     InvalidToken=None
-    MultiFernet=None
     
 from .paths import KEY_FILE, DB_FILE
 
@@ -49,6 +50,8 @@ class VaultKey:
     def __str__(self):
         return self.__repr__()
         
+_SQL_UPDATE_SECRET = "UPDATE credentials SET encrypted_secret=? WHERE service=? AND item=?"
+
 MSG_CRYPTO_HELP = (
     "Encryption is not available. Install with crypto extra:\n"
     "  uv add \"dworshak-secret[crypto]\"\n"
@@ -70,8 +73,13 @@ def load_current_key(
     key_path: Path | str | None = None
 ) -> bytes:
     target_key_path = resolve_key_path_for_db(db_path, key_path)
-    check_key_path(target_key_path)
-    return target_key_path.read_bytes()
+    # EAFP: one open+read instead of an exists() stat followed by the read
+    try:
+        return target_key_path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"Encryption key file not found at {target_key_path.absolute()}"
+        ) from None
 
 def generate_new_key() -> bytes:
     """Generate a fresh Fernet-compatible key (32 bytes base64-encoded)."""
@@ -79,15 +87,46 @@ def generate_new_key() -> bytes:
     return Fernet.generate_key()
 
 
+def _write_key_file(key_path: Path, key_bytes: bytes, exclusive: bool = False):
+    """
+    Write key bytes with mode 0o600 applied at creation, so no chmod follows.
+
+    exclusive=True refuses to overwrite an existing key. Otherwise the key is
+    written to a sibling temp file and swapped in with os.replace(), so a reader
+    never sees a partially written key.
+    """
+    if exclusive:
+        _write_new_file(key_path, key_bytes)
+    else:
+        os.replace(_stage_key_file(key_path, key_bytes), key_path)
+
+def _stage_key_file(key_path: Path, key_bytes: bytes) -> Path:
+    """
+    Write key bytes, fsynced, to the sibling temp file that _write_key_file()
+    swaps in, and return its path. The key at key_path is left untouched.
+    """
+    target = key_path.with_name(key_path.name + ".tmp")
+    target.unlink(missing_ok=True)
+    _write_new_file(target, key_bytes)
+    return target
+
+def _write_new_file(path: Path, data: bytes):
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
 def create_vault_key(db_path, key_path):
     installation_check()
-    if Path(key_path).exists():
-        raise FileExistsError(f"Key file already exists: {key_path}")
+    key_path = Path(key_path)
     key_path.parent.mkdir(parents=True, exist_ok=True)
 
     key = Fernet.generate_key()
-    key_path.write_bytes(key)
-    ensure_secure_permissions(key_path)
+    try:
+        _write_key_file(key_path, key, exclusive=True)
+    except FileExistsError:
+        raise FileExistsError(f"Key file already exists: {key_path}") from None
 
     register_vault_key(db_path, {
         "key_path": str(Path(key_path).resolve()),
@@ -100,6 +139,7 @@ def rotate_key(
     dry_run: bool = False,
     auto_backup: bool = True,
     extra_backup_suffix: str = "pre-key-rotation",
+    batch_size: int = 10_000,
 ) -> Tuple[bool, str, Optional[List[str]]]:
     """
     Perform (or simulate) a full key rotation.
@@ -108,17 +148,18 @@ def rotate_key(
     1. Check vault health
     2. (Optional) Create backup
     3. Generate new key
-    4. Use MultiFernet to decrypt with old key, encrypt with new
-    5. Re-write every credential (only if not dry_run)
+    4. Decrypt with the old key (Fernet or AES-GCM blobs), encrypt with the
+       new key in the client's cipher
+    5. Re-write every credential (only if not dry_run), batch_size rows at a
+       time, all within one transaction
     6. Replace key file on disk (only if not dry_run)
 
     Returns:
         (success: bool, message: str, affected_credentials: list[str] | None)
     """
-    from .actions import backup_vault
-    from .vault import check_vault 
-    from .paths import ensure_secure_permissions
+    from .vault import check_vault, connect, transaction
     from .crypto.fernet import FernetBackend
+    from .crypto.aesgcm import AESGCMBackend
     #from cryptography.fernet import Fernet
     
     installation_check()
@@ -132,7 +173,7 @@ def rotate_key(
     # ── Backup phase ──
     backup_path: Optional[Path] = None
     if auto_backup:
-        backup_path = backup_vault(
+        backup_path = client.backup_vault(
             extra_suffix=extra_backup_suffix,
             include_timestamp=True,
         )
@@ -149,45 +190,38 @@ def rotate_key(
 
     new_key = generate_new_key()
 
-    # MultiFernet allows decrypting with old key while encrypting with new
-    transition_fernet = MultiFernet([Fernet(new_key), Fernet(old_key)])
-    
-    transition_backend = FernetBackend.from_fernet(
-        transition_fernet
-    )
+    # The AES-GCM backend reads both blob formats, so a vault with mixed,
+    # or only Fernet, blobs comes out entirely in the client's cipher.
+    if client.cipher == "aesgcm":
+        new_backend, multi = AESGCMBackend(new_key), None
+    else:
+        from .security import get_multi_fernet
+        new_backend, multi = FernetBackend(new_key), get_multi_fernet([new_key, old_key])
+    transition_backend = _RotationBackend(AESGCMBackend(old_key), new_backend, multi)
 
     # ── Re-encryption phase ──
-    credentials = client.list_contents()
-    if not credentials:
-        return True, f"No credentials to rotate. {backup_info}", []
-
     affected: List[str] = []
     conn = None
+    staged_key: Optional[Path] = None
+    committed = False
 
     try:
-        conn = sqlite3.connect(client.db_path)
-        conn.row_factory = sqlite3.Row
-        
-        for service, item in credentials:
-            plaintext = client.get(
-                            service, 
-                            item
-                            )
-            if plaintext is None:
-                return False, f"Failed to read secret {service}/{item}", affected
-
-            affected.append(f"{service}/{item}")
-
-            if dry_run:
-                continue
+        conn = connect(client.db_path)
+        if dry_run:
+            _reencrypt_credentials(conn, transition_backend, affected, batch_size, write=False)
+        else:
+            # One transaction holds the write lock from the first read to the commit
+            with transaction(conn):
+                _reencrypt_credentials(conn, transition_backend, affected, batch_size, write=True)
+                if affected:
+                    # The new key is on disk (fsynced) before the rows that
+                    # need it commit; a failure here rolls them back.
+                    staged_key = _stage_key_file(key_path, new_key)
+            committed = True
+
+        if not affected:
+            return True, f"No credentials to rotate. {backup_info}", []
 
-            # Re-store using transition fernet (encrypts with primary = new key)
-            client.set(
-                        service = service, 
-                        item = item, 
-                        value = plaintext, 
-                        crypto_backend=transition_backend
-                        )
         if dry_run:
             return (
                 True,
@@ -195,11 +229,18 @@ def rotate_key(
                 affected,
             )
 
-        conn.commit()
-
         # Atomically replace the key file
-        key_path.write_bytes(new_key)
-        ensure_secure_permissions(key_path)
+        try:
+            os.replace(staged_key, key_path)
+        except OSError as exc:
+            return (
+                False,
+                f"Credentials were re-encrypted but the new key could not replace {key_path}: {exc}. "
+                f"The new key is at {staged_key}; move it into place before using the vault. {backup_info}",
+                affected,
+            )
+        from .security import invalidate_fernet_cache
+        invalidate_fernet_cache(key_path)
 
         return (
             True,
@@ -207,16 +248,62 @@ def rotate_key(
             affected,
         )
 
-    except InvalidToken as exc:
+    except (InvalidToken, WrongKeyError) as exc:
         return False, f"Decryption failure during rotation: {exc}", affected
     except Exception as exc:
-        if conn:
-            conn.rollback()
         return False, f"Rotation failed: {exc}", affected
     finally:
+        if staged_key is not None and not committed:
+            staged_key.unlink(missing_ok=True)
         if conn:
             conn.close()
 
+class _RotationBackend:
+    """Decrypts with the outgoing key's backend, encrypts with the new one."""
+
+    def __init__(self, old_backend, new_backend, multi=None):
+        self.decrypt = old_backend.decrypt
+        self.encrypt = new_backend.encrypt
+        # MultiFernet([new, old]).rotate() re-encrypts a Fernet token in one
+        # call; the rfernet adapter has no rotate(), so fall back there.
+        self._rotate_fernet = getattr(multi, "rotate", None)
+
+    def rotate(self, token: bytes, aad: bytes | None = None) -> bytes:
+        from .crypto.base import AESGCM_VERSIONS
+        if self._rotate_fernet is not None and token[:1] not in AESGCM_VERSIONS:
+            return self._rotate_fernet(token)
+        return self.encrypt(self.decrypt(token, aad=aad), aad=aad)
+
+def _reencrypt_credentials(
+    conn: sqlite3.Connection,
+    backend,
+    affected: List[str],
+    batch_size: int,
+    write: bool,
+):
+    """
+    Decrypt every credential with the transition backend and, if write, store
+    it re-encrypted under the new key. Appends "service/item" to affected.
+    """
+    from .vault import iter_credential_pages
+    from .crypto.base import row_aad
+
+    # Page through the ciphertexts so memory stays bounded on large vaults;
+    # each page is written back before the next is read.
+    for page in iter_credential_pages(conn, batch_size=batch_size):
+        updates: List[Tuple[bytes, str, str]] = []
+        for service, item, encrypted in page:
+            aad = row_aad(service, item)
+            if write:
+                updates.append((backend.rotate(encrypted, aad=aad), service, item))
+            else:
+                # A dry run still proves every credential decrypts
+                backend.decrypt(encrypted, aad=aad)
+            affected.append(f"{service}/{item}")
+
+        if updates:
+            conn.executemany(_SQL_UPDATE_SECRET, updates)
+
 def rotate_key_dry_run(client: DworshakSecret) -> Tuple[bool, str, Optional[List[str]]]:
     """
     Convenience wrapper — always runs in dry-run mode.
@@ -231,24 +318,5 @@ def installation_check(die = True):
             sys.exit(1)
         return False
     return True
-'''
-def rotate_vault_key(db_path: Path, old_key_bytes: bytes, new_key_bytes: bytes):
-    """Decrypts the entire vault database with the old key and re-encrypts with the new key."""
-    
-    # 1. Read and decrypt everything using old bytes
-    raw_decrypted_payload = decrypt_entire_database(db_path, old_key_bytes)
-    
-    # 2. Re-encrypt using new bytes
-    new_encrypted_payload = encrypt_entire_database(raw_decrypted_payload, new_key_bytes)
-    
-    # 3. Atomic write back to the database path
-    tmp_db = db_path.with_suffix(".tmp")
-    tmp_db.write_bytes(new_encrypted_payload)
-    tmp_db.replace(db_path)
-    
-    # 4. Update your fingerprint registry with the new signature
-    new_fingerprint = calculate_key_fingerprint(new_key_bytes)
-    update_registry_fingerprint(db_path, new_fingerprint)
-'''
 if __name__ == "__main__":
     installation_check()
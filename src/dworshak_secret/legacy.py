@@ -1,5 +1,6 @@
 # src/dworshak_secret/legacy.py
 from __future__ import annotations
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
@@ -7,14 +8,19 @@ from .core import DworshakSecret
 
 # --- Legacy Functional API (Compatibility Layer) ---
 
+@lru_cache(maxsize=4)
+def _client(db_path: Path | str | None) -> DworshakSecret:
+    # Repeated calls on one path share a client (and its resolved key path)
+    return DworshakSecret(db_path)
+
 def get_secret(service: str, item: str, fail: bool = False, db_path: Path | str | None = None) -> str | None:
-    return DworshakSecret(db_path).get(service, item, fail=fail)
+    return _client(db_path).get(service, item, fail=fail)
 
 def store_secret(service: str, item: str, secret: str, overwrite: bool = True, db_path: Path | str | None = None):
-    return DworshakSecret(db_path).set(service = service, item = item, value = secret, overwrite=overwrite, fernet=None)
+    return _client(db_path).set(service = service, item = item, value = secret, overwrite=overwrite)
 
 def list_credentials(db_path: Path | str | None = None) -> List[tuple[str, str]]:
-    return DworshakSecret(db_path).list_contents()
+    return _client(db_path).list_contents()
 
 def remove_secret(service: str, item: str, db_path: Path | str | None = None) -> bool:
-    return DworshakSecret(db_path).remove(service, item)
+    return _client(db_path).remove(service, item)
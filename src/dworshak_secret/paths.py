@@ -1,8 +1,8 @@
-# src/dworshak_access/paths.py
+# src/dworshak_secret/paths.py
 from __future__ import annotations
 from pathlib import Path
+from functools import lru_cache
 import time
-import datetime
 import os
 import stat
 
@@ -11,26 +11,27 @@ DB_FILE = APP_DIR / "vault.db"
 KEY_FILE = APP_DIR / ".key"
 CONFIG_FILE = APP_DIR / "config.json"
 KEY_REGISTRY_FILE = APP_DIR / "register" / "keys.json"
+EXPORTS_DIR = APP_DIR / "exports"
+
+# Set once EXPORTS_DIR has been created in this process
+_exports_dir_ready = False
 
 
 def get_default_export_path(subject: str="dworshark_export", suffix: str = ".json") -> Path:
     """
     Standardizes output paths: ~/.dworshak/exports/dworshark_export_1706000000.json
     """
-    # 1. Resolve Home with Fallback
-    try:
-        base_home = Path.home() / ".dworshak"
-    except Exception:
-        base_home = Path("/tmp/.dworshak_temp")
-    
-    export_dir = base_home / "exports"
-    export_dir.mkdir(parents=True, exist_ok=True)
+    global _exports_dir_ready
+    # 1. Ensure the export directory exists (once per process)
+    if not _exports_dir_ready:
+        EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        _exports_dir_ready = True
 
     # 2. Build filename with Unix Timestamp
     unix_ts = int(time.time())
     filename = f"{subject}_{unix_ts}{suffix}"
     
-    return export_dir / filename
+    return EXPORTS_DIR / filename
 
 def get_vault_backup_filename(
     extra_suffix: str = "",
@@ -47,7 +48,7 @@ def get_vault_backup_filename(
     parts = [base]
 
     if include_timestamp:
-        ts = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d_%H%M%S")
+        ts = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
         parts.append(ts)
 
     if extra_suffix:
@@ -89,6 +90,34 @@ def ensure_secure_permissions(path: Path) -> bool:
             return False
     return True
 
+def resolve_db_path(db_path: Path | str | None = None) -> Path:
+    """
+    Normalize a vault path: expanded and resolved, or DB_FILE when omitted.
+
+    The default vault always comes back as the DB_FILE object itself, so
+    `resolve_db_path(p) == DB_FILE` holds whether p was a str or a Path.
+    """
+    if not db_path:
+        return DB_FILE
+    db_path = os.path.expanduser(str(db_path))
+    if os.path.isabs(db_path):
+        return _resolve_absolute_db_path(db_path)
+    # Relative paths depend on the cwd, so they are not memoized
+    return _normalize_db_path(db_path)
+
+@lru_cache(maxsize=32)
+def _resolve_absolute_db_path(db_path: str) -> Path:
+    return _normalize_db_path(db_path)
+
+def _normalize_db_path(db_path: str) -> Path:
+    resolved = Path(db_path).resolve()
+    return DB_FILE if resolved == _resolved_db_file() else resolved
+
+@lru_cache(maxsize=1)
+def _resolved_db_file() -> Path:
+    # DB_FILE itself is unresolved: $HOME may sit behind a symlink
+    return DB_FILE.resolve()
+
 def resolve_key_path_for_db(
     db_path: Path | str | None = None,
     key_path: Path | str | None = None,
@@ -102,7 +131,7 @@ def resolve_key_path_for_db(
     """
     from .registry import get_registered_key
 
-    db_p = Path(db_path).resolve() if db_path else DB_FILE
+    db_p = resolve_db_path(db_path)
 
     # 1. Ensure Path type
     if key_path:
@@ -1,36 +1,135 @@
-# src/dworshak_access/security.py
+# src/dworshak_secret/security.py
 from __future__ import annotations
 from pathlib import Path
+from typing import Any, Callable
 
-def get_key_str_from_key_path(
-    key_path: Path | str | None = None
-    )->str:
+# rfernet is an optional Rust (PyO3) Fernet implementation; tokens are
+# interchangeable with cryptography's, so it is preferred when installed.
+# Probed on first use, so commands that never touch a secret do not load it.
+_rfernet = None  # the module once probed, False if it is not installed
+
+def _load_rfernet() -> Any:
+    global _rfernet
+    if _rfernet is None:
+        try:
+            import rfernet
+            _rfernet = rfernet
+        except ImportError:
+            _rfernet = False
+    return _rfernet or None
+
+def __getattr__(name: str) -> bool:
+    # PEP 562: RFERNET_AVAILABLE stays importable without an eager probe
+    if name == "RFERNET_AVAILABLE":
+        return _load_rfernet() is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class RFernet:
     """
-    Returns a Fernet instance using the master key.
-    Generates key if missing.
+    Adapter exposing rfernet with the bytes-in/bytes-out surface of
+    cryptography.fernet.Fernet.
+
+    rfernet takes str keys and str tokens; the vault stores tokens as BLOBs.
+    Decryption failures are re-raised as cryptography's InvalidToken so callers
+    keep a single exception to catch.
     """
-    key_str = key_path.read_bytes()
-    return key_str
-    
+
+    def __init__(self, key: bytes | str):
+        self._fernet = _load_rfernet().Fernet(_as_str(key))
+
+    @classmethod
+    def multi(cls, keys: list[bytes | str]) -> RFernet:
+        obj = cls.__new__(cls)
+        obj._fernet = _load_rfernet().MultiFernet([_as_str(k) for k in keys])
+        return obj
+
+    def encrypt(self, data: bytes) -> bytes:
+        return self._fernet.encrypt(data).encode("ascii")
+
+    def decrypt(self, token: bytes | str) -> bytes:
+        from cryptography.fernet import InvalidToken
+        try:
+            return self._fernet.decrypt(_as_str(token))
+        except (_load_rfernet().DecryptionError, UnicodeDecodeError):
+            raise InvalidToken from None
+
+def _as_str(value: bytes | str) -> str:
+    return value.decode("ascii") if isinstance(value, bytes) else value
+
 def get_fernet(
-    key_str: str | None = None
-    ):
+    key_str: bytes | str | None = None
+    ) -> Any:
     """
     Returns a Fernet instance using the master key.
-    Generates key if missing.
+    Uses the rfernet backend when available.
     """
     # Check without dying
-    from .key import installation_check
-    if not installation_check(die=False):
+    from . import key
+    if not key.CRYPTO_AVAILABLE:
+        key.installation_check(die=False)  # prints the install hint
         return None
+    if _load_rfernet() is not None:
+        return RFernet(key_str)
     from cryptography.fernet import Fernet
 
     return Fernet(key_str)
 
+# Ciphers built from a key file, keyed by (key path, mtime_ns, inode, kind).
+# Rewriting or replacing the key file changes the stat signature, so a stale
+# key is never served.
+_FERNET_CACHE: dict[tuple[str, int, int, str], Any] = {}
+
+def get_cached_fernet(key_path: Path) -> Any:
+    """
+    Returns a Fernet for the key file at key_path, memoized per key file so
+    repeated vault operations skip the read and key setup.
+    """
+    return get_cached_cipher(key_path, get_fernet, kind="fernet")
+
+def get_cached_cipher(key_path: Path, factory: Callable[[bytes], Any], kind: str) -> Any:
+    """
+    Returns factory(key_bytes) for the key file at key_path, memoized per key
+    file and kind. factory returning None (crypto unavailable) is not cached.
     """
+    key_path = Path(key_path)
     try:
-        return Fernet(key_str)
-    except Exception:
-        return None
+        st = key_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Encryption key file not found at {key_path}") from None
 
+    cache_key = (str(key_path), st.st_mtime_ns, st.st_ino, kind)
+    cipher = _FERNET_CACHE.get(cache_key)
+    if cipher is None:
+        cipher = factory(key_path.read_bytes())
+        if cipher is None:
+            return None
+        # Another thread may evict the same entries concurrently: snapshot the
+        # keys with list() and tolerate ones already gone
+        for old in [k for k in list(_FERNET_CACHE) if k[0] == cache_key[0] and k[3] == kind]:
+            _FERNET_CACHE.pop(old, None)
+        _FERNET_CACHE[cache_key] = cipher
+    return cipher
+
+def invalidate_fernet_cache(key_path: Path | str | None = None) -> None:
+    """Drop cached ciphers for key_path, or all of them."""
+    if key_path is None:
+        _FERNET_CACHE.clear()
+        return
+    path_str = str(key_path)
+    for cache_key in [k for k in list(_FERNET_CACHE) if k[0] == path_str]:
+        _FERNET_CACHE.pop(cache_key, None)
+
+def get_multi_fernet(keys: list[bytes | str]) -> Any:
+    """
+    Returns a MultiFernet over keys; the first key encrypts, all keys decrypt.
+    Uses the rfernet backend when available.
     """
+    from . import key
+    if not key.CRYPTO_AVAILABLE:
+        key.installation_check(die=False)  # prints the install hint
+        return None
+    if _load_rfernet() is not None:
+        return RFernet.multi(keys)
+    from cryptography.fernet import Fernet, MultiFernet
+
+    return MultiFernet([Fernet(k) for k in keys])
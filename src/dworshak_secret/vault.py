@@ -1,19 +1,27 @@
-# src/dworshak_access/vault.py
+# src/dworshak_secret/vault.py
 from __future__ import annotations
 import sqlite3
 import os
 import stat
+import threading
+import atexit
 from pathlib import Path
-from typing import NamedTuple
+from typing import Iterator, NamedTuple
 from enum import IntEnum
 from dataclasses import dataclass
+from contextlib import contextmanager
 import logging
 
 logger = logging.getLogger(__name__)
 
-from .paths import DB_FILE, resolve_key_path_for_db, ensure_secure_permissions
+from .paths import resolve_db_path, resolve_key_path_for_db, ensure_secure_permissions
 
-CURRENT_TOOL_SCHEMA_VERSION = 2
+CURRENT_TOOL_SCHEMA_VERSION = 4
+
+# Vault files ensure_vault() has checked and brought up to
+# CURRENT_TOOL_SCHEMA_VERSION in this process: path -> (st_dev, st_ino) at the
+# time. A replaced file no longer matches and is checked again.
+_migrated: dict[str, tuple[int, int]] = {}
 
 class VaultCode(IntEnum):
     DIR_MISSING = 0
@@ -50,8 +58,97 @@ class VaultResponse:
     message: str
     is_new: bool = False
 
-def initialize_vault(db_path, key_path,force:bool=False)->VaultResponse:
+def connect(db_path: Path | str) -> sqlite3.Connection:
+    """
+    Open a connection to the vault database with per-connection PRAGMAs applied.
+
+    Autocommit mode (isolation_level=None): callers that need a multi-statement
+    transaction issue BEGIN explicitly. journal_mode=WAL is persistent and is
+    set once when the vault is created.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-8000")  # KiB, i.e. ~8 MB page cache
+    return conn
+
+@contextmanager
+def transaction(conn: sqlite3.Connection, mode: str = "IMMEDIATE") -> Iterator[sqlite3.Connection]:
+    """
+    Run a block inside an explicit transaction on an autocommit connection.
+
+    BEGIN IMMEDIATE takes the write lock up front rather than upgrading mid
+    transaction. Commits on success, rolls back on any exception.
+    """
+    conn.execute(f"BEGIN {mode}")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+# One connection per (thread, vault path); sqlite3 connections are not shared
+# across threads, and reconnecting on every call re-reads the file header.
+_local = threading.local()
+
+def get_connection(db_path: Path | str) -> sqlite3.Connection:
+    """Return this thread's pooled connection to db_path, opening it on first use."""
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(str(db_path))
+    if conn is None:
+        conn = conns[str(db_path)] = connect(db_path)
+        # The file this connection holds open, checked by ensure_vault()
+        _pooled_identities()[str(db_path)] = _file_identity(Path(db_path))
+    return conn
+
+def _pooled_identities() -> dict[str, tuple[int, int] | None]:
+    identities = getattr(_local, "identities", None)
+    if identities is None:
+        identities = _local.identities = {}
+    return identities
+
+def close_connections(db_path: Path | str | None = None) -> None:
+    """Close this thread's pooled connections, for db_path only or all of them."""
+    conns = getattr(_local, "conns", None)
+    if not conns:
+        return
+    keys = [str(db_path)] if db_path else list(conns)
+    for key in keys:
+        _pooled_identities().pop(key, None)
+        conn = conns.pop(key, None)
+        if conn is not None:
+            conn.close()
+
+atexit.register(close_connections)
+
+def backup_to(db_path: Path | str, dest: Path | str) -> None:
+    """
+    Copy the vault to dest with SQLite's online backup API.
+
+    Unlike a file copy after a checkpoint, this includes frames still in the
+    WAL and is consistent even while other connections read or write.
+    """
+    # Create dest as 0o600 up front so the copy is never world-readable
+    os.close(os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+    src = connect(db_path)
+    try:
+        dst = sqlite3.connect(dest)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+def initialize_vault(db_path: Path | str, key_path: Path | str | None, force: bool = False) -> VaultResponse:
     from .key import create_vault_key
+    # A pooled connection may still point at a vault file that was replaced
+    close_connections(db_path)
+    _migrated.pop(str(db_path), None)
     # 1. Check if the DB exists and has a schema already
     pre_res = _initialize_vault_pre_key(db_path)
     
@@ -67,7 +164,7 @@ def initialize_vault(db_path, key_path,force:bool=False)->VaultResponse:
     create_vault_key(db_path, key_path)
     return VaultResponse(success=True, message="Fresh vault created and corresponding fresh key created.", is_new=True)
 
-def force_initialize_vault(db_path, key_path)->VaultResponse:
+def force_initialize_vault(db_path: Path | str, key_path: Path | str | None) -> VaultResponse:
     return initialize_vault(db_path, key_path, force=True)
         
 def _initialize_vault_pre_key(
@@ -76,34 +173,62 @@ def _initialize_vault_pre_key(
     """Infrastructure setup: ensures directories and base schema exist."""
     #from .security import get_fernet
 
-    db_path = Path(db_path) if db_path else DB_FILE
+    db_path = resolve_db_path(db_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
     #get_fernet(db_path,key_path)
 
-    conn = sqlite3.connect(db_path)
-    try:
-        existing_version = conn.execute("PRAGMA user_version").fetchone()[0]
-        logger.debug(f"dworshak-secret database existing_version = {existing_version}")
-        if existing_version == 0:
-            _create_base_schema(conn)
-            conn.execute(f"PRAGMA user_version = {CURRENT_TOOL_SCHEMA_VERSION}")
-            conn.commit()
-            return VaultResponse(success=True, message="New vault initialized.", is_new=True)
-        return VaultResponse(success=True, message="Vault verified.", is_new=False)
-    finally:
-        conn.close()
+    # The pooled connection: the first get/set after initialization reuses it
+    conn = get_connection(db_path)
+    existing_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    logger.debug(f"dworshak-secret database existing_version = {existing_version}")
+    if existing_version == 0:
+        _create_base_schema(conn)
+        return VaultResponse(success=True, message="New vault initialized.", is_new=True)
+    return VaultResponse(success=True, message="Vault verified.", is_new=False)
+
+def ensure_vault(db_path: Path | str | None) -> None:
+    """
+    Raise RuntimeError unless the vault is usable; migrate it on first use.
 
-def ensure_vault(db_path):
-    status = check_vault(db_path)
+    Uses check_vault_fast() once per vault file per process; after that a
+    single stat() confirms it is the same file. Corruption is not probed here:
+    SQLite raises DatabaseError on the operation itself.
+    """
+    db_path = resolve_db_path(db_path)
+    key = str(db_path)
+    identity = _file_identity(db_path)
+    # A pooled connection opened on a file since deleted or replaced would keep
+    # using the old inode: writes would be lost, stale rows served.
+    pooled = _pooled_identities().get(key)
+    if pooled is not None and pooled != identity:
+        close_connections(db_path)
+    if identity is not None and _migrated.get(key) == identity:
+        return
+
+    status = check_vault_fast(db_path)
     if not status.is_valid:
         raise RuntimeError(status.message)
+    _run_migrations(get_connection(db_path))
+    if identity is not None:
+        _migrated[key] = identity
+
+def check_vault_fast(db_path: Path | str | None = None) -> VaultStatus:
+    """check_vault() without the corruption probe: stats only, no PRAGMA."""
+    return check_vault(db_path, integrity=False)
 
 def check_vault(
     db_path: Path | str | None = None, 
+    integrity: bool = True,
+    deep: bool = False,
     ) -> VaultStatus:
-    """The source of truth for vault health."""
+    """
+    The source of truth for vault health.
+
+    integrity=False skips the corruption probe (see check_vault_fast());
+    deep=True runs the full integrity_check instead of quick_check.
+    """
 
-    db_path = Path(db_path) if db_path else DB_FILE
+    db_path = resolve_db_path(db_path)
     vault_root = db_path.parent
 
     if not vault_root.exists():
@@ -116,7 +241,12 @@ def check_vault(
             CURRENT_TOOL_SCHEMA_VERSION
         )
 
-    if not db_path.exists():
+    # One stat answers existence, the permission warning and rw_code
+    try:
+        st = db_path.stat()
+    except OSError:
+        st = None
+    if st is None:
         return VaultStatus(
             is_valid = False, 
             message = f"Vault DB missing: {db_path.name}", 
@@ -126,13 +256,14 @@ def check_vault(
             vault_db_version = CURRENT_TOOL_SCHEMA_VERSION
         )
 
+    rw_mode = stat.S_IMODE(st.st_mode)
     
-    if is_db_corrupted(db_path):
+    if integrity and is_db_corrupted(db_path, deep=deep):
         return VaultStatus(
             False, 
             "Vault DB corrupted", 
             vault_root, 
-            _get_rw_mode(db_path), 
+            rw_mode, 
             VaultCode.DB_CORRUPTED, 
             CURRENT_TOOL_SCHEMA_VERSION
         )
@@ -140,14 +271,14 @@ def check_vault(
     # Permission checks for non-Windows
     warnings = []
     if os.name != "nt":
-        if not _is_600(db_path): warnings.append("vault.db permissions not 600")
+        if rw_mode != 0o600: warnings.append("vault.db permissions not 600")
 
     if warnings:
         return VaultStatus(
             True, 
             f"Healthy (warnings: {'; '.join(warnings)})", 
             vault_root, 
-            _get_rw_mode(db_path), 
+            rw_mode, 
             VaultCode.DB_FILE_HEALTHY_WITH_RW_WARNINGS, 
             CURRENT_TOOL_SCHEMA_VERSION
         )
@@ -156,7 +287,7 @@ def check_vault(
         True, 
         "Vault healthy", 
         vault_root, 
-        _get_rw_mode(db_path), 
+        rw_mode, 
         VaultCode.HEALTHY, 
         CURRENT_TOOL_SCHEMA_VERSION
     )
@@ -165,14 +296,16 @@ def check_key_file(
     key_path: Path | str | None = None,
     ) -> KeyStatus:
     """The source of truth for key health."""
-    from .paths import ensure_secure_permissions
+    from .paths import ensure_secure_permissions, KEY_FILE
+    key_path = Path(key_path) if key_path else KEY_FILE
     # Logic: Key check
-    if not key_path.exists():
+    rw_mode = _get_rw_mode(key_path)
+    if rw_mode is None:
         return KeyStatus(
             is_valid = False, # True, changed June 2026 
             message = "Key missing/Crypto unavailable", 
             key_path = key_path, 
-            rw_code = _get_rw_mode(key_path), 
+            rw_code = rw_mode, 
             health_code = KeyCode.KEY_FILE_MISSING
         )
     # ---
@@ -181,14 +314,14 @@ def check_key_file(
     # Permission checks for non-Windows
     warnings = []
     if os.name != "nt":
-        if not _is_600(key_path): warnings.append(".key permissions not 600")
+        if rw_mode != 0o600: warnings.append(".key permissions not 600")
 
     if warnings:
         return KeyStatus(
             is_valid = True, 
             message = f"Healthy (warnings: {'; '.join(warnings)})", 
             key_path = key_path, 
-            rw_code = _get_rw_mode(key_path), 
+            rw_code = rw_mode, 
             health_code = KeyCode.KEY_FILE_HEALTHY_WITH_RW_WARNINGS, 
         )
 
@@ -196,40 +329,118 @@ def check_key_file(
         is_valid = True, 
         message = "Key healthy", 
         key_path = key_path, 
-        rw_code = _get_rw_mode(key_path), 
+        rw_code = rw_mode, 
         health_code = KeyCode.HEALTHY
     )
 
-def heal_vault_file(db_path: Path):
+def iter_credential_pages(
+    conn: sqlite3.Connection,
+    batch_size: int = 10_000,
+    ) -> Iterator[list[tuple[str, str, bytes]]]:
+    """
+    Yield lists of (service, item, encrypted_secret) rows in primary-key order,
+    at most batch_size rows per list.
+
+    Keyset pagination (carry the last (service, item) forward) keeps memory
+    flat on large vaults and, unlike OFFSET, costs the same for every page.
+    """
+    rows = conn.execute(
+        "SELECT service, item, encrypted_secret FROM credentials "
+        "ORDER BY service, item LIMIT ?",
+        (batch_size,),
+    ).fetchall()
+    while rows:
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last_service, last_item = rows[-1][0], rows[-1][1]
+        rows = conn.execute(
+            "SELECT service, item, encrypted_secret FROM credentials "
+            "WHERE (service, item) > (?, ?) ORDER BY service, item LIMIT ?",
+            (last_service, last_item, batch_size),
+        ).fetchall()
+
+def heal_vault_file(db_path: Path) -> None:
     # Self-healing if requested
     ensure_secure_permissions(db_path)
 
-def heal_key_file(key_path: Path):
+def heal_key_file(key_path: Path) -> None:
     # Self-healing if requested
     ensure_secure_permissions(key_path)
     
 
-def is_db_corrupted(db_path: Path) -> bool:
-    conn = sqlite3.connect(db_path)
-    try:
-        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
-        return result != "ok"
-    finally:
-        conn.close()
+def is_db_corrupted(db_path: Path, deep: bool = False) -> bool:
+    # quick_check skips the index-vs-table cross checks and stops at the first
+    # error; integrity_check verifies everything and is O(database size).
+    pragma = "PRAGMA integrity_check" if deep else "PRAGMA quick_check(1)"
+    conn = get_connection(db_path)
+    result = conn.execute(pragma).fetchone()[0]
+    return result != "ok"
+
+# WITHOUT ROWID: rows live in the (service, item) primary key b-tree itself,
+# so a point lookup is one traversal and there is no separate rowid table.
+_CREDENTIALS_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        service TEXT NOT NULL,
+        item TEXT NOT NULL,
+        encrypted_secret BLOB NOT NULL,
+        PRIMARY KEY(service, item)
+    ) WITHOUT ROWID
+"""
+
+# Narrow copy of the key columns: listing scans it instead of the
+# primary-key b-tree, which also carries every encrypted_secret blob.
+_CREDENTIALS_INDEX_DDL = """
+    CREATE INDEX IF NOT EXISTS idx_credentials_service_item
+    ON credentials(service, item)
+"""
 
-def _create_base_schema(conn: sqlite3.Connection):
+def _create_base_schema(conn: sqlite3.Connection) -> None:
+    # One executescript batch: journal mode, schema and version stamp.
+    conn.executescript(f"""
+        PRAGMA journal_mode=WAL;
+        {_CREDENTIALS_DDL.format(table="credentials")};
+        {_CREDENTIALS_INDEX_DDL};
+        PRAGMA user_version = {CURRENT_TOOL_SCHEMA_VERSION};
+    """)
+
+def _run_migrations(conn: sqlite3.Connection) -> None:
+    """Bring an existing vault up to CURRENT_TOOL_SCHEMA_VERSION, in one transaction."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == 0 or version >= CURRENT_TOOL_SCHEMA_VERSION:
+        return
+
+    with transaction(conn):
+        # Re-read under the write lock; another process may have migrated
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 3:
+            _migrate_credentials_without_rowid(conn)
+        if version < 4:
+            conn.execute(_CREDENTIALS_INDEX_DDL)
+        if version < CURRENT_TOOL_SCHEMA_VERSION:
+            conn.execute(f"PRAGMA user_version = {CURRENT_TOOL_SCHEMA_VERSION}")
+            logger.debug(f"dworshak-secret database migrated from version {version}")
+
+    # Vaults created before WAL was the default; cannot change inside a transaction
+    conn.execute("PRAGMA journal_mode=WAL")
+
+def _migrate_credentials_without_rowid(conn: sqlite3.Connection) -> None:
+    conn.execute(_CREDENTIALS_DDL.format(table="credentials_new"))
     conn.execute("""
-        CREATE TABLE IF NOT EXISTS credentials (
-            service TEXT NOT NULL,
-            item TEXT NOT NULL,
-            encrypted_secret BLOB NOT NULL,
-            PRIMARY KEY(service, item)
-        )
+        INSERT INTO credentials_new (service, item, encrypted_secret)
+        SELECT service, item, encrypted_secret FROM credentials
     """)
+    conn.execute("DROP TABLE credentials")
+    conn.execute("ALTER TABLE credentials_new RENAME TO credentials")
+
+def _file_identity(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
 
 def _get_rw_mode(path: Path) -> int | None:
     try: return stat.S_IMODE(path.stat().st_mode)
     except Exception: return None
 
-def _is_600(path: Path) -> bool:
-    return _get_rw_mode(path) == 0o600
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import sqlite3
+import pytest
+from cryptography.fernet import Fernet
+
+from dworshak_secret.core import DworshakSecret
+from dworshak_secret.crypto.aesgcm import AESGCMBackend, AESGCM_VERSION, AESGCM_ROW_VERSION
+from dworshak_secret.errors import WrongKeyError
+
+
+def test_aesgcm_reads_fernet_blobs_and_writes_gcm(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set("service", "old", "fernetMN")
+
+    backend = AESGCMBackend.from_key_path(mgr.resolve_key_path())
+    gcm = DworshakSecret(db_path=tmp_path / "vault.db", crypto_backend=backend)
+    gcm.set("service", "new", "gcmOP")
+
+    assert gcm.get("service", "old") == "fernetMN"
+    assert gcm.get("service", "new") == "gcmOP"
+    assert backend.encrypt(b"x")[:1] == AESGCM_VERSION
+    assert AESGCMBackend.from_key_path(mgr.resolve_key_path()) is backend
+
+def test_aesgcm_wrong_key_raises():
+    blob = AESGCMBackend(Fernet.generate_key()).encrypt(b"secretQR")
+
+    with pytest.raises(WrongKeyError):
+        AESGCMBackend(Fernet.generate_key()).decrypt(blob)
+
+def test_cipher_selection_writes_gcm_and_reads_fernet(tmp_path, monkeypatch):
+    db = tmp_path / "vault.db"
+    fernet_client = DworshakSecret(db_path=db)
+    fernet_client.initialize_vault()
+    fernet_client.set("service", "old", "fernetST")
+
+    monkeypatch.setenv("DWORSHAK_CIPHER", "aesgcm")
+    gcm_client = DworshakSecret(db_path=db)
+    gcm_client.set("service", "new", "gcmUV")
+
+    assert gcm_client.cipher == "aesgcm"
+    conn = sqlite3.connect(db)
+    blob, = conn.execute("SELECT encrypted_secret FROM credentials WHERE item='new'").fetchone()
+    conn.close()
+    assert blob[:1] == AESGCM_ROW_VERSION
+    assert gcm_client.get("service", "old") == "fernetST"
+    assert gcm_client.get("service", "new") == "gcmUV"
+    assert DworshakSecret(db_path=db, cipher="fernet").cipher == "fernet"
+    with pytest.raises(ValueError):
+        DworshakSecret(db_path=db, cipher="rot13")
+
+def test_default_client_reads_aesgcm_rows(tmp_path, monkeypatch):
+    monkeypatch.delenv("DWORSHAK_CIPHER", raising=False)
+    db = tmp_path / "vault.db"
+    fernet_client = DworshakSecret(db_path=db)
+    fernet_client.initialize_vault()
+    fernet_client.set("s", "old", "fernetYZ")
+    DworshakSecret(db_path=db, cipher="aesgcm").set("s", "new", "gcmAB")
+
+    assert fernet_client.cipher == "fernet"
+    assert fernet_client.get("s", "new") == "gcmAB"
+    assert fernet_client.get("s", "old") == "fernetYZ"
+
+def test_aesgcm_blob_moved_to_another_row_fails(tmp_path):
+    db = tmp_path / "vault.db"
+    mgr = DworshakSecret(db_path=db, cipher="aesgcm")
+    mgr.initialize_vault()
+    mgr.set("s", "a", "secretCD")
+    mgr.set("s", "b", "secretEF")
+
+    conn = sqlite3.connect(db)
+    blob, = conn.execute("SELECT encrypted_secret FROM credentials WHERE item='a'").fetchone()
+    conn.execute("UPDATE credentials SET encrypted_secret=? WHERE item='b'", (blob,))
+    conn.commit()
+    conn.close()
+
+    assert mgr.get("s", "a") == "secretCD"
+    with pytest.raises(WrongKeyError):
+        mgr.get("s", "b")
+    with pytest.raises(WrongKeyError):
+        DworshakSecret(db_path=db).get("s", "b")
@@ -9,3 +9,68 @@ def test_check_vault_reports_missing_dir(tmp_path):
 
     assert status.is_valid is False
     assert "missing" in status.message.lower()
+
+def test_check_vault_does_not_load_crypto(tmp_path):
+    from unittest.mock import patch
+
+    secret_manager = DworshakSecret(db_path=tmp_path / "vault.db")
+    secret_manager.initialize_vault()
+
+    with patch("dworshak_secret.security.get_fernet", side_effect=AssertionError), \
+         patch("dworshak_secret.security.get_cached_fernet", side_effect=AssertionError):
+        status = secret_manager.check_vault()
+
+    assert status.is_valid is True
+
+def test_ensure_vault_checks_once_per_file(tmp_path):
+    from unittest.mock import patch
+    from dworshak_secret import vault
+
+    secret_manager = DworshakSecret(db_path=tmp_path / "vault.db")
+    secret_manager.initialize_vault()
+
+    with patch("dworshak_secret.vault.check_vault", wraps=vault.check_vault) as spy:
+        secret_manager.set("service", "item", "onceST")
+        secret_manager.get("service", "item")
+        secret_manager.list_contents()
+        assert spy.call_count == 1
+
+        # initialize_vault() may replace the file, so it forgets the result
+        secret_manager.initialize_vault()
+        secret_manager.get("service", "item")
+        assert spy.call_count == 2
+
+def test_crud_path_never_probes_integrity(tmp_path):
+    from unittest.mock import patch
+
+    secret_manager = DworshakSecret(db_path=tmp_path / "vault.db")
+    secret_manager.initialize_vault()
+
+    with patch("dworshak_secret.vault.is_db_corrupted", side_effect=AssertionError):
+        secret_manager.set("service", "item", "fastAB")
+        assert secret_manager.get("service", "item") == "fastAB"
+    # The explicit health check still does
+    with patch("dworshak_secret.vault.is_db_corrupted", return_value=True):
+        assert secret_manager.check_vault().is_valid is False
+
+def test_check_vault_quick_by_default_deep_on_request(tmp_path):
+    from unittest.mock import patch
+    from dworshak_secret import vault
+
+    secret_manager = DworshakSecret(db_path=tmp_path / "vault.db")
+    secret_manager.initialize_vault()
+
+    with patch("dworshak_secret.vault.is_db_corrupted", wraps=vault.is_db_corrupted) as spy:
+        assert secret_manager.check_vault().is_valid is True
+        assert secret_manager.check_vault(deep=True).is_valid is True
+    assert [c.kwargs["deep"] for c in spy.call_args_list] == [False, True]
+
+def test_check_key_file_accepts_str_path(tmp_path):
+    from dworshak_secret.vault import check_key_file, KeyCode
+
+    key = tmp_path / "vault.key"
+    key.write_bytes(b"key")
+    key.chmod(0o600)
+
+    assert check_key_file(str(key)).is_valid is True
+    assert check_key_file(str(tmp_path / "missing.key")).health_code == KeyCode.KEY_FILE_MISSING
@@ -0,0 +1,97 @@
+from __future__ import annotations
+import threading
+
+from dworshak_secret.vault import get_connection, close_connections
+
+
+def test_get_connection_is_pooled_per_thread(tmp_path):
+    db = tmp_path / "vault.db"
+    conn = get_connection(db)
+    assert get_connection(db) is conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_connection(db)))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+    close_connections(db)
+    assert get_connection(db) is not conn
+    close_connections(db)
+
+def test_initialize_vault_leaves_connection_pooled(tmp_path):
+    from unittest.mock import patch
+    from dworshak_secret import vault
+    from dworshak_secret.core import DworshakSecret
+
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    with patch("dworshak_secret.vault.connect", wraps=vault.connect) as spy:
+        mgr.initialize_vault()
+        mgr.set("service", "item", "pooledUV")
+        assert mgr.get("service", "item") == "pooledUV"
+    assert spy.call_count == 1
+    close_connections(mgr.db_path)
+
+def test_context_manager_closes_pooled_connection(tmp_path):
+    from dworshak_secret.core import DworshakSecret
+
+    with DworshakSecret(db_path=tmp_path / "vault.db") as mgr:
+        mgr.initialize_vault()
+        mgr.set("service", "item", "ctxWX")
+        conn = get_connection(mgr.db_path)
+    assert get_connection(mgr.db_path) is not conn
+    close_connections(mgr.db_path)
+
+def test_context_manager_validates_vault_once(tmp_path):
+    import sqlite3
+    from unittest.mock import patch
+    import pytest
+    from dworshak_secret import vault
+    from dworshak_secret.core import DworshakSecret
+
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    with patch("dworshak_secret.vault.ensure_vault", wraps=vault.ensure_vault) as spy:
+        with mgr:
+            for n in range(5):
+                mgr.set("service", f"item{n}", "onceYZ")
+                mgr.get("service", f"item{n}")
+            assert spy.call_count == 1
+
+            # An OperationalError forces revalidation on the next call
+            with patch("dworshak_secret.vault.get_connection", side_effect=sqlite3.OperationalError):
+                with pytest.raises(sqlite3.OperationalError):
+                    mgr.get("service", "item0")
+            mgr.get("service", "item0")
+            assert spy.call_count == 2
+
+        mgr.get("service", "item0")
+        mgr.get("service", "item0")
+        assert spy.call_count == 4
+
+def test_vault_recreated_under_live_client_gets_the_write(tmp_path):
+    import sqlite3
+    from dworshak_secret import vault
+    from dworshak_secret.core import DworshakSecret
+
+    db = tmp_path / "vault.db"
+    mgr = DworshakSecret(db_path=db)
+    mgr.initialize_vault()
+    mgr.set("service", "before", "oldAB")
+
+    # Another process deletes the vault and creates a fresh one in its place
+    for suffix in ("", "-wal", "-shm"):
+        (tmp_path / f"vault.db{suffix}").unlink(missing_ok=True)
+    other = sqlite3.connect(db)
+    vault._create_base_schema(other)
+    other.close()
+    db.chmod(0o600)
+
+    mgr.set("service", "after", "newCD")
+
+    assert mgr.list_contents() == [("service", "after")]
+    on_disk = sqlite3.connect(db)
+    rows = on_disk.execute("SELECT service, item FROM credentials").fetchall()
+    on_disk.close()
+    assert rows == [("service", "after")]
+    close_connections(db)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import base64
+import json
+
+from dworshak_secret.core import DworshakSecret
+
+
+def test_export_vault_encrypted_base64_blobs(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set("service", "item", "plainYZ")
+
+    out = mgr.export_vault(output_path=tmp_path / "export.json")
+
+    data = json.loads((tmp_path / "export.json").read_text())
+    assert out == str(tmp_path / "export.json")
+    assert data["metadata"]["decrypted"] is False
+    assert data["metadata"]["blob_encoding"] == "base64"
+    row, = data["tables"]["credentials"]
+    assert (row["service"], row["item"]) == ("service", "item")
+    assert row["encrypted_secret"] != "plainYZ"
+    base64.b64decode(row["encrypted_secret"], validate=True)
+
+def test_export_vault_decrypted_round_trips(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set("service", "one", "firstAB")
+    mgr.set("service", "two", "secondCD")
+
+    mgr.export_vault(output_path=tmp_path / "export.json", decrypt=True, yes=True)
+
+    data = json.loads((tmp_path / "export.json").read_text())
+    assert data["metadata"]["decrypted"] is True
+    rows = {r["item"]: r["encrypted_secret"] for r in data["tables"]["credentials"]}
+    assert rows == {"one": "firstAB", "two": "secondCD"}
+
+def test_export_vault_decrypts_mixed_fernet_and_gcm(tmp_path):
+    from dworshak_secret.crypto.aesgcm import AESGCMBackend
+
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set("service", "fernet", "oldEF")
+    backend = AESGCMBackend.from_key_path(mgr.resolve_key_path())
+    mgr.set("service", "gcm", "newGH", crypto_backend=backend)
+
+    mgr.export_vault(output_path=tmp_path / "export.json", decrypt=True, yes=True)
+
+    data = json.loads((tmp_path / "export.json").read_text())
+    rows = {r["item"]: r["encrypted_secret"] for r in data["tables"]["credentials"]}
+    assert rows == {"fernet": "oldEF", "gcm": "newGH"}
+
+def test_backup_includes_wal_frames_while_a_reader_is_open(tmp_path):
+    import sqlite3
+    from dworshak_secret.vault import connect
+
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    # An open read transaction keeps a checkpoint from emptying the WAL
+    reader = connect(mgr.db_path)
+    reader.execute("BEGIN")
+    reader.execute("SELECT count(*) FROM credentials").fetchone()
+    mgr.set("service", "item", "walEF")
+
+    backup_path = mgr.backup_vault(dest_dir=tmp_path / "backups")
+    reader.rollback()
+    reader.close()
+
+    assert backup_path is not None
+    assert backup_path.stat().st_mode & 0o777 == 0o600
+    conn = sqlite3.connect(backup_path)
+    rows = conn.execute("SELECT service, item FROM credentials").fetchall()
+    conn.close()
+    assert rows == [("service", "item")]
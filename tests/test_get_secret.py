@@ -6,7 +6,7 @@ from dworshak_secret.core import DworshakSecret
 
 def test_secret_roundtrip_with_mocked_crypto(tmp_path):
     # Scope the mock exclusively to this block
-    with patch("dworshak_secret.crypto.fernet.get_fernet") as mock_get_fernet:
+    with patch("dworshak_secret.security.get_fernet") as mock_get_fernet:
         fake_fernet = Mock()
         fake_fernet.encrypt.return_value = b"encrypted-secret"
         fake_fernet.decrypt.return_value = b"secretXY"
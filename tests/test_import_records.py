@@ -0,0 +1,47 @@
+from __future__ import annotations
+import json
+
+from dworshak_secret.core import DworshakSecret
+
+
+def _write_export(path, rows, decrypted=True):
+    path.write_text(json.dumps({
+        "metadata": {"decrypted": decrypted},
+        "tables": {"credentials": rows},
+    }))
+    return path
+
+def test_import_records_adds_and_skips(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set("service", "existing", "keepUV")
+    export = _write_export(tmp_path / "export.json", [
+        {"service": "service", "item": "existing", "encrypted_secret": "newUV"},
+        {"service": "service", "item": "fresh", "encrypted_secret": "freshWX"},
+    ])
+
+    stats = mgr.import_records(json_path=export)
+
+    assert stats == {"added": 1, "updated": 0, "skipped": 1}
+    assert mgr.get("service", "existing") == "keepUV"
+    assert mgr.get("service", "fresh") == "freshWX"
+
+def test_import_records_overwrite_updates(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set("service", "existing", "oldYZ")
+    export = _write_export(tmp_path / "export.json", [
+        {"service": "service", "item": "existing", "encrypted_secret": "newYZ"},
+    ])
+
+    stats = mgr.import_records(json_path=export, overwrite=True)
+
+    assert stats == {"added": 0, "updated": 1, "skipped": 0}
+    assert mgr.get("service", "existing") == "newYZ"
+
+def test_import_records_rejects_encrypted_export(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    export = _write_export(tmp_path / "export.json", [], decrypted=False)
+
+    assert mgr.import_records(json_path=export) is None
@@ -8,3 +8,16 @@ def test_initialize_vault_creates_key_and_db(tmp_path):
     key_path= mgr.resolve_key_path()
     assert key_path.exists()
     assert key_path.read_bytes() != b""
+
+def test_initialize_vault_enables_wal(tmp_path):
+    import sqlite3
+    from dworshak_secret.core import DworshakSecret
+
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+
+    conn = sqlite3.connect(tmp_path / "vault.db")
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        conn.close()
@@ -0,0 +1,30 @@
+from __future__ import annotations
+import subprocess
+import sys
+
+
+def _loaded_after(statement: str, modules: list[str]) -> list[str]:
+    code = (
+        f"import sys; {statement}; "
+        f"print(','.join(m for m in {modules!r} if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+def test_package_import_defers_core_and_crypto():
+    heavy = ["dworshak_secret.core", "sqlite3", "cryptography", "rfernet"]
+    assert _loaded_after("import dworshak_secret", heavy) == []
+    assert "dworshak_secret.core" in _loaded_after(
+        "from dworshak_secret import DworshakSecret", heavy
+    )
+
+def test_core_import_defers_sqlite_and_vault():
+    heavy = ["sqlite3", "dworshak_secret.vault", "cryptography"]
+    assert _loaded_after("import dworshak_secret.core", heavy) == []
+    assert _loaded_after("from dworshak_secret.core import DworshakSecret; DworshakSecret()", heavy) == []
+
+def test_eager_flag_imports_everything_up_front(monkeypatch):
+    monkeypatch.setenv("DWORSHAK_EAGER", "1")
+    heavy = ["dworshak_secret.core", "dworshak_secret.vault", "sqlite3",
+             "cryptography.fernet", "dworshak_secret.crypto.aesgcm"]
+    assert _loaded_after("import dworshak_secret", heavy) == heavy
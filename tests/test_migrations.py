@@ -0,0 +1,65 @@
+from __future__ import annotations
+import sqlite3
+
+from dworshak_secret.core import DworshakSecret
+from dworshak_secret.vault import CURRENT_TOOL_SCHEMA_VERSION
+
+
+class FakeCryptoBackend:
+    def encrypt(self, data: bytes) -> bytes:
+        return b"enc:" + data
+
+    def decrypt(self, data: bytes) -> bytes:
+        return data.replace(b"enc:", b"")
+
+def _make_v2_vault(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE credentials (
+            service TEXT NOT NULL,
+            item TEXT NOT NULL,
+            encrypted_secret BLOB NOT NULL,
+            PRIMARY KEY(service, item)
+        )
+    """)
+    conn.execute("INSERT INTO credentials VALUES ('service', 'item', ?)", (b"enc:secretQR",))
+    conn.execute("PRAGMA user_version = 2")
+    conn.commit()
+    conn.close()
+
+def test_v2_vault_is_migrated_on_first_use(tmp_path):
+    db = tmp_path / "vault.db"
+    _make_v2_vault(db)
+
+    mgr = DworshakSecret(db_path=db, crypto_backend=FakeCryptoBackend())
+    assert mgr.get("service", "item") == "secretQR"
+
+    conn = sqlite3.connect(db)
+    try:
+        sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name='credentials'"
+        ).fetchone()[0]
+        index = conn.execute(
+            "SELECT name FROM sqlite_master WHERE name='idx_credentials_service_item'"
+        ).fetchone()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        conn.close()
+    assert "WITHOUT ROWID" in sql
+    assert index is not None
+    assert journal_mode == "wal"
+    assert version == CURRENT_TOOL_SCHEMA_VERSION
+
+def test_listing_scans_covering_index(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db", crypto_backend=FakeCryptoBackend())
+    mgr.initialize_vault()
+
+    conn = sqlite3.connect(tmp_path / "vault.db")
+    try:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT service, item FROM credentials"
+        ).fetchall()
+    finally:
+        conn.close()
+    assert "COVERING INDEX idx_credentials_service_item" in plan[0][-1]
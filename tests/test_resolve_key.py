@@ -50,3 +50,36 @@ def test_registry_relative_path(tmp_path, monkeypatch):
     resolved = resolve_key_path_for_db(db)
 
     assert resolved == (tmp_path / "relative.key").resolve()
+
+def test_resolve_db_path_normalizes_to_default(tmp_path, monkeypatch):
+    from dworshak_secret.paths import DB_FILE, resolve_db_path
+
+    assert resolve_db_path(None) is DB_FILE
+    assert resolve_db_path(str(DB_FILE)) is DB_FILE
+    assert resolve_db_path(DB_FILE) is DB_FILE
+
+    monkeypatch.chdir(tmp_path)
+    assert resolve_db_path("vault.db") == tmp_path.resolve() / "vault.db"
+    (tmp_path / "sub").mkdir()
+    monkeypatch.chdir(tmp_path / "sub")
+    assert resolve_db_path("vault.db") == tmp_path.resolve() / "sub" / "vault.db"
+
+    # A $HOME behind a symlink still maps onto the DB_FILE object
+    from dworshak_secret import paths
+    real_home = tmp_path / "realhome"
+    (real_home / ".dworshak").mkdir(parents=True)
+    link_home = tmp_path / "linkhome"
+    link_home.symlink_to(real_home)
+    db_file = link_home / ".dworshak" / "vault.db"
+    key_file = link_home / ".dworshak" / ".key"
+    monkeypatch.setattr(paths, "DB_FILE", db_file)
+    monkeypatch.setattr(paths, "KEY_FILE", key_file)
+    paths._resolved_db_file.cache_clear()
+    paths._resolve_absolute_db_path.cache_clear()
+    try:
+        assert paths.resolve_db_path(str(db_file)) is db_file
+        assert paths.resolve_db_path(real_home / ".dworshak" / "vault.db") is db_file
+        assert paths.resolve_key_path_for_db(str(db_file)) == key_file
+    finally:
+        paths._resolved_db_file.cache_clear()
+        paths._resolve_absolute_db_path.cache_clear()
@@ -0,0 +1,29 @@
+from __future__ import annotations
+import pytest
+
+rfernet = pytest.importorskip("rfernet")
+from cryptography.fernet import Fernet, InvalidToken
+
+from dworshak_secret.security import RFernet, get_multi_fernet
+
+
+def test_rfernet_tokens_interoperate_with_cryptography():
+    key = Fernet.generate_key()
+
+    token = RFernet(key).encrypt(b"secretEF")
+    assert isinstance(token, bytes)
+    assert Fernet(key).decrypt(token) == b"secretEF"
+    assert RFernet(key).decrypt(Fernet(key).encrypt(b"secretGH")) == b"secretGH"
+
+def test_rfernet_wrong_key_raises_invalid_token():
+    token = RFernet(Fernet.generate_key()).encrypt(b"secretIJ")
+
+    with pytest.raises(InvalidToken):
+        RFernet(Fernet.generate_key()).decrypt(token)
+
+def test_multi_fernet_decrypts_old_and_encrypts_new():
+    old_key, new_key = Fernet.generate_key(), Fernet.generate_key()
+    transition = get_multi_fernet([new_key, old_key])
+
+    plaintext = transition.decrypt(Fernet(old_key).encrypt(b"secretKL"))
+    assert Fernet(new_key).decrypt(transition.encrypt(plaintext)) == b"secretKL"
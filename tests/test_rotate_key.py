@@ -0,0 +1,133 @@
+from __future__ import annotations
+from dworshak_secret.core import DworshakSecret
+
+
+def test_rotate_key_reencrypts_and_client_stays_usable(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set("service", "item", "secretMN")
+    old_key = mgr.resolve_key_path().read_bytes()
+
+    success, message, affected = mgr.rotate_key(auto_backup=False)
+
+    assert success, message
+    assert affected == ["service/item"]
+    assert mgr.resolve_key_path().read_bytes() != old_key
+    assert mgr.get("service", "item") == "secretMN"
+    assert DworshakSecret(db_path=tmp_path / "vault.db").get("service", "item") == "secretMN"
+
+def test_rotate_key_dry_run_changes_nothing(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set("service", "item", "secretOP")
+    old_key = mgr.resolve_key_path().read_bytes()
+
+    success, _, affected = mgr.rotate_key(dry_run=True, auto_backup=False)
+
+    assert success
+    assert affected == ["service/item"]
+    assert mgr.resolve_key_path().read_bytes() == old_key
+    assert mgr.get("service", "item") == "secretOP"
+
+def test_rotate_key_pages_through_credentials(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    expected = {(f"service{n}", "item"): f"secret{n}" for n in range(5)}
+    for (service, item), value in expected.items():
+        mgr.set(service, item, value)
+
+    success, message, affected = mgr.rotate_key(auto_backup=False, batch_size=2)
+
+    assert success, message
+    assert len(affected) == 5
+    for (service, item), value in expected.items():
+        assert mgr.get(service, item) == value
+
+def test_rotate_key_failure_rolls_back(tmp_path):
+    from cryptography.fernet import Fernet
+    from dworshak_secret.vault import get_connection
+
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set("service", "item", "secretST")
+    old_key = mgr.resolve_key_path().read_bytes()
+    # A row under a foreign key makes rotation fail partway through
+    get_connection(mgr.db_path).execute(
+        "INSERT INTO credentials VALUES ('zservice', 'item', ?)",
+        (Fernet(Fernet.generate_key()).encrypt(b"other"),),
+    )
+
+    success, message, _ = mgr.rotate_key(auto_backup=False, batch_size=1)
+
+    assert not success
+    assert "Decryption failure" in message
+    assert mgr.resolve_key_path().read_bytes() == old_key
+    assert mgr.get("service", "item") == "secretST"
+
+def test_rotate_key_writes_client_cipher(tmp_path):
+    import sqlite3
+    from dworshak_secret.crypto.aesgcm import AESGCM_ROW_VERSION
+
+    db = tmp_path / "vault.db"
+    fernet_client = DworshakSecret(db_path=db)
+    fernet_client.initialize_vault()
+    fernet_client.set("service", "old", "fernetUV")
+    gcm_client = DworshakSecret(db_path=db, cipher="aesgcm")
+    gcm_client.set("service", "new", "gcmWX")
+
+    success, message, affected = gcm_client.rotate_key(auto_backup=False)
+
+    assert success, message
+    assert sorted(affected) == ["service/new", "service/old"]
+    conn = sqlite3.connect(db)
+    blobs = [row[0] for row in conn.execute("SELECT encrypted_secret FROM credentials")]
+    conn.close()
+    assert all(blob[:1] == AESGCM_ROW_VERSION for blob in blobs)
+    assert gcm_client.get("service", "old") == "fernetUV"
+    assert gcm_client.get("service", "new") == "gcmWX"
+
+    success, message, _ = fernet_client.rotate_key(auto_backup=False)
+
+    assert success, message
+    assert fernet_client.get("service", "new") == "gcmWX"
+
+def test_rotate_key_key_write_failure_rolls_back(tmp_path, monkeypatch):
+    from dworshak_secret import key
+
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set("service", "item", "diskGH")
+    old_key = mgr.resolve_key_path().read_bytes()
+
+    def no_space(*args):
+        raise OSError(28, "No space left on device")
+    monkeypatch.setattr(key, "_stage_key_file", no_space)
+
+    success, message, _ = mgr.rotate_key(auto_backup=False)
+
+    assert not success
+    assert "No space left" in message
+    assert mgr.resolve_key_path().read_bytes() == old_key
+    assert mgr.get("service", "item") == "diskGH"
+
+def test_rotate_key_keeps_staged_key_when_replace_fails(tmp_path, monkeypatch):
+    import os
+    from dworshak_secret import key
+
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set("service", "item", "stagedIJ")
+    key_path = mgr.resolve_key_path()
+
+    def replace_fails(src, dst):
+        raise OSError(13, "Permission denied")
+    monkeypatch.setattr(key.os, "replace", replace_fails)
+
+    success, message, _ = mgr.rotate_key(auto_backup=False)
+
+    assert not success
+    staged = key_path.with_name(key_path.name + ".tmp")
+    assert str(staged) in message
+    monkeypatch.undo()
+    os.replace(staged, key_path)
+    assert mgr.get("service", "item") == "stagedIJ"
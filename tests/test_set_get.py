@@ -1,3 +1,4 @@
+import pytest
 from dworshak_secret.core import DworshakSecret
 
 def test_set_get_roundtrip(tmp_path):
@@ -11,3 +12,38 @@ def test_set_get_roundtrip(tmp_path):
     value = mgr.get("github", "token")
 
     assert value == "test123"
+
+def test_set_many_is_all_or_nothing(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+
+    mgr.set_many([("github", "token", "abc"), ("gitlab", "token", "def")])
+    assert mgr.get("gitlab", "token") == "def"
+
+    # None.encode() fails mid-batch, after the first row was bound
+    with pytest.raises(AttributeError):
+        mgr.set_many([("github", "token", "changed"), ("bad", "row", None)])
+    assert mgr.get("github", "token") == "abc"
+    assert mgr.get("bad", "row") is None
+    assert mgr.list_contents() == [("github", "token"), ("gitlab", "token")]
+
+def test_iter_contents_yields_pairs(tmp_path):
+    mgr = DworshakSecret(db_path=tmp_path / "vault.db")
+    mgr.initialize_vault()
+    mgr.set_many([("b", "two", "x"), ("a", "one", "y")])
+
+    pairs = mgr.iter_contents()
+    assert not isinstance(pairs, list)
+    assert sorted(pairs) == [("a", "one"), ("b", "two")]
+    assert sorted(mgr.list_contents()) == [("a", "one"), ("b", "two")]
+
+def test_legacy_functions_roundtrip(tmp_path):
+    from dworshak_secret.legacy import get_secret, store_secret, list_credentials, remove_secret
+
+    db = tmp_path / "vault.db"
+    DworshakSecret(db_path=db).initialize_vault()
+
+    store_secret("github", "token", "legacyYZ", db_path=db)
+    assert get_secret("github", "token", db_path=db) == "legacyYZ"
+    assert list_credentials(db_path=db) == [("github", "token")]
+    assert remove_secret("github", "token", db_path=db) is True